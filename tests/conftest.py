@@ -0,0 +1,90 @@
+"""Shared pytest configuration for VisionAgent tests."""
+
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _make_pyautogui_stub() -> types.ModuleType:
+    """Build a stand-in for pyautogui that never touches the display."""
+    stub = types.ModuleType("pyautogui")
+    for name in (
+        "click", "typewrite", "write", "press", "hotkey",
+        "scroll", "hscroll", "moveTo", "drag", "screenshot",
+    ):
+        setattr(stub, name, MagicMock(name=f"pyautogui.{name}"))
+    stub.size = MagicMock(name="pyautogui.size", return_value=(1920, 1080))
+    stub.position = MagicMock(name="pyautogui.position", return_value=(0, 0))
+    stub.FAILSAFE = True
+    stub.PAUSE = 0.1
+    return stub
+
+
+# Install before any test module imports vision_agent.actions, so the real
+# pyautogui (and Xlib/pyscreeze/mouseinfo behind it) is never loaded.
+sys.modules.setdefault("pyautogui", _make_pyautogui_stub())
+
+
+@pytest.fixture(scope="session")
+def dry_executor():
+    """A dry-run ActionExecutor shared by every test in the session.
+    
+    Dry-run actions keep no state, so one instance can be reused.
+    """
+    from vision_agent.actions import ActionExecutor
+    return ActionExecutor(dry_run=True)
+
+
+class FakeCompletions:
+    """Stand-in for ``client.chat.completions`` that returns canned replies.
+    
+    ``reply`` is either the message content to return or a callable that
+    takes the request kwargs and returns it. Requests are kept in ``calls``.
+    """
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+    
+    def _respond(self, kwargs):
+        self.calls.append(kwargs)
+        content = self.reply(kwargs) if callable(self.reply) else self.reply
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+    
+    def create(self, **kwargs):
+        return self._respond(kwargs)
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        return self._respond(kwargs)
+
+
+def _fake_client(completions):
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+
+@pytest.fixture
+def make_vision_model():
+    """Build a VisionModel whose sync and async clients return ``reply``."""
+    from vision_agent.vision import VisionModel
+    
+    def make(reply):
+        return VisionModel(
+            client=_fake_client(FakeCompletions(reply)),
+            async_client=_fake_client(FakeAsyncCompletions(reply)),
+        )
+    return make
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    """A small PNG screenshot on disk."""
+    from PIL import Image
+    
+    path = tmp_path / "screen.png"
+    Image.new("RGB", (64, 48), "white").save(path)
+    return path
@@ -0,0 +1,185 @@
+"""Tests for ActionExecutor."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from vision_agent import actions
+from vision_agent.actions import ActionExecutor
+
+
+def test_dry_run_actions(dry_executor):
+    """Dry-run actions succeed without touching the screen."""
+    assert dry_executor.click(100, 100).success
+    assert dry_executor.type_text("test").success
+    assert dry_executor.scroll("down").success
+
+
+def test_type_text_pastes_long_text(monkeypatch):
+    """Long printable text goes through the clipboard, short text is typed."""
+    clipboard = MagicMock()
+    monkeypatch.setattr(actions, "pyperclip", clipboard, raising=False)
+    monkeypatch.setattr(actions, "PYPERCLIP_AVAILABLE", True)
+    monkeypatch.setattr(actions.pyautogui, "hotkey", MagicMock())
+    monkeypatch.setattr(actions.pyautogui, "typewrite", MagicMock())
+    executor = ActionExecutor(paste_threshold=10)
+
+    monkeypatch.setattr(actions, "_PASTE_SETTLE", 0)
+    clipboard.paste.return_value = "copied by the user"
+
+    long_text = "a" * 11
+    result = executor.type_text(long_text)
+    assert result.success
+    # The user's clipboard is put back after pasting
+    assert [c.args for c in clipboard.copy.call_args_list] == [
+        (long_text,), ("copied by the user",),
+    ]
+    actions.pyautogui.hotkey.assert_called_once_with(actions.PASTE_MODIFIER, "v")
+
+    # paste=False keeps the text off the clipboard
+    executor.type_text("secret-token", paste=False)
+    actions.pyautogui.typewrite.assert_called_once_with("secret-token", interval=0.02)
+    actions.pyautogui.typewrite.reset_mock()
+    assert clipboard.copy.call_count == 2
+
+    executor.type_text("short")
+    actions.pyautogui.typewrite.assert_called_once_with("short", interval=0.02)
+
+
+def test_execute_dispatches_by_name(dry_executor):
+    """execute() routes action names to the matching method."""
+    assert dry_executor.execute("click", 5, 6).details == "[DRY RUN] Would click at (5, 6)"
+    assert dry_executor.execute("hotkey", "ctrl", "c").details == "[DRY RUN] Would press: ctrl+c"
+    assert dry_executor.execute("scroll", direction="up").details == "[DRY RUN] Would scroll up by 3"
+
+    result = dry_executor.execute("teleport")
+    assert not result.success
+    assert result.error == "Unknown action"
+
+
+def test_screenshot_reused_until_action(monkeypatch, tmp_path):
+    """A recent screenshot is reused until an action changes the screen."""
+    grab = MagicMock()
+    grab.return_value.save.side_effect = lambda path, **kwargs: open(path, "wb").close()
+    monkeypatch.setattr(actions.pyautogui, "screenshot", grab)
+    monkeypatch.setattr(actions.pyautogui, "press", MagicMock())
+    executor = ActionExecutor(screenshot_ttl=60)
+
+    first = executor.screenshot(str(tmp_path / "a.png"))
+    second = executor.screenshot(str(tmp_path / "b.png"))
+    assert grab.call_count == 1
+    assert (tmp_path / "b.png").exists()
+    assert second == str(tmp_path / "b.png")
+
+    executor.press_key("enter")
+    executor.screenshot(first)
+    assert grab.call_count == 2
+
+
+def test_approve_plan_skips_per_action_prompts(monkeypatch):
+    """One approval covers the planned steps, then prompting resumes."""
+    answers = iter(["y", "n"])
+    prompts = []
+
+    def fake_input(prompt):
+        prompts.append(prompt)
+        return next(answers)
+
+    monkeypatch.setattr("builtins.input", fake_input)
+    monkeypatch.setattr(actions.pyautogui, "click", MagicMock())
+    executor = ActionExecutor(click_delay=0, confirm=True)
+
+    assert executor.approve_plan(["click a", "click b"]) == 2
+    assert executor.click(1, 2).success
+    assert executor._confirm_action("click(b)")
+    assert len(prompts) == 1
+
+    assert not executor._confirm_action("click(c)")
+    assert len(prompts) == 2
+
+
+def test_screenshot_default_paths_are_unique(monkeypatch):
+    """Screenshots without a path each get their own temp file."""
+    monkeypatch.setattr(actions.pyautogui, "screenshot", MagicMock())
+    executor = ActionExecutor(screenshot_ttl=0)
+
+    first = executor.screenshot()
+    second = executor.screenshot()
+    try:
+        assert first != second
+        assert Path(first).name.startswith("screenshot_")
+    finally:
+        Path(first).unlink()
+        Path(second).unlink()
+
+
+def test_scroll_directions(monkeypatch):
+    """Each direction maps to the right pyautogui call and sign."""
+    monkeypatch.setattr(actions.pyautogui, "scroll", MagicMock())
+    monkeypatch.setattr(actions.pyautogui, "hscroll", MagicMock())
+    executor = ActionExecutor()
+
+    executor.scroll("up", 2)
+    executor.scroll("down", 2)
+    executor.scroll("left", 4)
+    assert [c.args for c in actions.pyautogui.scroll.call_args_list] == [(2,), (-2,)]
+    actions.pyautogui.hscroll.assert_called_once_with(-4)
+
+    result = executor.scroll("sideways")
+    assert not result.success
+    assert result.error == "Unknown direction: sideways"
+
+
+def test_unknown_keys_rejected(monkeypatch, dry_executor):
+    """Key names pyautogui doesn't know fail before anything is pressed."""
+    monkeypatch.setattr(actions, "_VALID_KEYS", frozenset({"enter", "ctrl"}))
+
+    assert dry_executor.press_key("Enter").success
+    assert dry_executor.hotkey("ctrl", "c").success
+
+    result = dry_executor.press_key("entre")
+    assert not result.success
+    assert result.error == "Unknown key: entre"
+    assert dry_executor.hotkey("ctrl", "shfit").error == "Unknown key: shfit"
+
+
+def test_wait_until_stable_returns_once_screen_settles(monkeypatch):
+    """An unchanging screen ends the wait after a couple of polls."""
+    from PIL import Image
+
+    frames = [Image.new("RGB", (320, 180), "black")] + [Image.new("RGB", (320, 180), "white")] * 10
+    monkeypatch.setattr(actions.pyautogui, "screenshot", MagicMock(side_effect=frames))
+    executor = ActionExecutor()
+
+    waited = executor.wait_until_stable(timeout=5, interval=0.01)
+    assert waited < 1
+    # First frame differs, then two unchanged polls
+    assert actions.pyautogui.screenshot.call_count == 4
+
+
+def test_wait_until_stable_bounded_by_slow_grabs(monkeypatch):
+    """Slow screen grabs don't push the wait past its timeout."""
+    from itertools import cycle
+    from types import SimpleNamespace
+    from PIL import Image
+
+    # A fake clock: sleeping and grabbing the screen only advance it
+    clock = SimpleNamespace(now=0.0)
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    frames = cycle([Image.new("RGB", (32, 18), "black"), Image.new("RGB", (32, 18), "white")])
+
+    def slow_screenshot():
+        sleep(0.2)
+        return next(frames)
+
+    monkeypatch.setattr(actions, "time", SimpleNamespace(monotonic=lambda: clock.now, sleep=sleep))
+    monkeypatch.setattr(actions.pyautogui, "screenshot", slow_screenshot)
+    executor = ActionExecutor()
+
+    for _ in range(2):
+        start = clock.now
+        waited = executor.wait_until_stable(timeout=0.5)
+        assert waited == clock.now - start
+        assert waited <= 0.5 + 1e-9
@@ -0,0 +1,326 @@
+"""Agent initialization tests."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from vision_agent import VisionAgent
+from vision_agent.vision import VisionModel
+
+requires_api_key = pytest.mark.skipif(
+    not os.getenv("OPENAI_API_KEY"),
+    reason="OPENAI_API_KEY not set (vision features won't work)",
+)
+
+
+def test_agent_init(dry_executor):
+    """The action executor works without an API key."""
+    assert dry_executor.click(100, 100).success
+
+
+@requires_api_key
+def test_api_key():
+    """A vision model can be created when an API key is set."""
+    model = VisionModel()
+    assert model.model == "gpt-4o"
+
+
+@requires_api_key
+def test_agent_init_with_vision():
+    """A full agent can be created and driven in dry-run mode."""
+    agent = VisionAgent(dry_run=True, verbose=False)
+    assert agent.click(100, 100).success
+
+
+def test_find_elements_runs_concurrently(monkeypatch, make_vision_model, image_path):
+    """find_elements() returns one result per description, in order."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+    def reply(request):
+        query = request["messages"][1]["content"][0]["text"]
+        found = "submit" in query
+        return json.dumps({"found": found, "description": query, "x": 1, "y": 2})
+
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent.vision = make_vision_model(reply)
+
+    elements = agent.find_elements(["submit", "cancel", "submit again"], image_path)
+    assert [el is not None for el in elements] == [True, False, True]
+    assert len(agent.vision.async_client.chat.completions.calls) == 3
+
+
+def test_automate_splits_numbered_script(monkeypatch):
+    """A numbered multi-line script runs as one step per line."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    agent = VisionAgent(dry_run=True, verbose=False)
+
+    result = agent.automate("1. scroll down\n  2. type 'hello'\n- scroll up")
+    assert result.success
+    assert [step.command for step in result.steps] == [
+        "scroll down", "type 'hello'", "scroll up",
+    ]
+    assert result.steps[1].action_result.details == "[DRY RUN] Would type: hello..."
+
+
+def test_do_dispatches_on_first_word(monkeypatch, image_path):
+    """Simple commands are handled locally, keyed on their first word."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent.vision.plan_action = lambda command, image_path: []
+
+    assert agent.do("Scroll up", "x.png").details == "[DRY RUN] Would scroll up by 3"
+    assert agent.do("enter 'abc' here", "x.png").details == "[DRY RUN] Would type: abc..."
+    # No quoted text, so this falls through to the planner
+    assert agent.do("type something", image_path).error == "Planning failed"
+
+
+def test_do_encodes_screenshot_once(monkeypatch, make_vision_model):
+    """Planning and the follow-up element search share one encoded image."""
+    from PIL import Image
+    from vision_agent import vision
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+    def reply(request):
+        if "Command:" in request["messages"][1]["content"][0]["text"]:
+            return json.dumps({"steps": [{"action": "click", "target": "OK button"}]})
+        return json.dumps({"found": True, "x": 5, "y": 6})
+
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent.vision = make_vision_model(reply)
+    encoded = []
+    original = vision._encode_pil
+    monkeypatch.setattr(
+        vision, "_encode_pil", lambda *args: encoded.append(args) or original(*args)
+    )
+
+    result = agent.do("confirm the dialog", Image.new("RGB", (32, 32)))
+    assert result.details == "[DRY RUN] Would click at (5, 6)"
+    assert len(agent.vision.client.chat.completions.calls) == 2
+    assert len(encoded) == 1
+
+
+def test_automate_saves_screenshots_in_background(monkeypatch, tmp_path):
+    """Captures go to the model in memory and are still written to disk."""
+    from concurrent.futures import ThreadPoolExecutor
+    from PIL import Image
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.chdir(tmp_path)
+    agent = VisionAgent(dry_run=True, verbose=False)
+    capture = Image.new("RGB", (16, 16))
+    monkeypatch.setattr(agent.actions, "capture", lambda: capture)
+
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        assert agent._grab_screen(saver) is capture
+    assert (tmp_path / "va_screenshot_001.png").exists()
+
+
+def test_automate_batches_planned_steps(monkeypatch, make_vision_model):
+    """Consecutive planner-bound commands share one request and one encode."""
+    from PIL import Image
+    from vision_agent import vision
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    plans = {"plans": [
+        {"steps": [{"action": "click", "x": 1, "y": 2}]},
+        {"steps": [{"action": "click", "x": 3, "y": 4}]},
+    ]}
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent.vision = make_vision_model(json.dumps(plans))
+    agent._grab_screen = lambda saver=None: Image.new("RGB", (32, 32))
+    agent.actions.wait_until_stable = lambda timeout: 0.0
+    encoded = []
+    original = vision._encode_pil
+    monkeypatch.setattr(
+        vision, "_encode_pil", lambda *args: encoded.append(args) or original(*args)
+    )
+
+    result = agent.automate(["open the menu", "pick settings", "scroll down"], batch_size=4)
+    assert result.success
+    assert [step.action_result.details for step in result.steps] == [
+        "[DRY RUN] Would click at (1, 2)",
+        "[DRY RUN] Would click at (3, 4)",
+        "[DRY RUN] Would scroll down by 3",
+    ]
+    calls = agent.vision.client.chat.completions.calls
+    assert len(calls) == 1
+    assert "2. pick settings" in calls[0]["messages"][1]["content"][0]["text"]
+    # Planned steps with coordinates don't encode their own screenshots
+    assert len(encoded) == 1
+
+
+def test_progress_goes_through_logging(monkeypatch, caplog):
+    """Verbose agents log progress to the "vision_agent" logger; quiet ones don't."""
+    import logging
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    caplog.set_level(logging.INFO, logger="vision_agent")
+
+    VisionAgent(dry_run=True, verbose=False).scroll("down")
+    assert not caplog.records
+
+    VisionAgent(dry_run=True).type_text("x" * 40)
+    assert caplog.messages == ["⌨️ Typing: " + "x" * 30 + "..."]
+
+
+@pytest.fixture
+def openai_server(monkeypatch):
+    """A local HTTP server answering chat completions, used as OPENAI_BASE_URL."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            server.open_connections += 1
+
+        def finish(self):
+            super().finish()
+            server.open_connections -= 1
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            content = json.dumps({"found": True, "x": 1, "y": 2})
+            body = json.dumps({
+                "id": "chatcmpl-test", "object": "chat.completion", "created": 0,
+                "model": "gpt-4o",
+                "choices": [{
+                    "index": 0, "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }],
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.open_connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_find_elements_twice_with_real_client(openai_server, image_path):
+    """Each find_elements() run closes the async client bound to its event loop."""
+    import time
+
+    agent = VisionAgent(dry_run=True, verbose=False)
+
+    for _ in range(2):
+        elements = agent.find_elements(["ok", "cancel"], image_path)
+        assert [(el.x, el.y) for el in elements] == [(1, 2), (1, 2)]
+        # No connection outlives the run's event loop
+        deadline = time.monotonic() + 2
+        while openai_server.open_connections and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert openai_server.open_connections == 0
+
+
+def test_interrupted_automation_revokes_approval(monkeypatch):
+    """Ctrl+C mid-script doesn't leave later actions pre-approved."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+    agent = VisionAgent(confirm=True, verbose=False)
+
+    def interrupt(command, image_path):
+        raise KeyboardInterrupt
+
+    agent.do = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        agent.automate(["scroll down", "scroll up", "scroll down"])
+    assert agent.actions._approved_through == 0
+
+
+def test_failed_batch_falls_back_to_single_plans(monkeypatch, make_vision_model, image_path):
+    """A failing batch request is tried once; its steps are then planned singly."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+    def reply(request):
+        if request["messages"][1]["content"][0]["text"].startswith("Commands:"):
+            raise RuntimeError("max_tokens is too large")
+        return json.dumps({"steps": [{"action": "click", "x": 1, "y": 2}]})
+
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent.vision = make_vision_model(reply)
+    agent._grab_screen = lambda saver=None: image_path
+    agent.actions.wait_until_stable = lambda timeout: 0.0
+
+    result = agent.automate(["open the menu", "pick settings", "close it"], batch_size=50)
+    assert result.success
+    calls = agent.vision.client.chat.completions.calls
+    # One batch attempt, then one plan per step
+    assert len(calls) == 4
+    assert calls[0]["max_tokens"] == 3000
+
+    from vision_agent.vision import MAX_PLAN_TOKENS
+    prepared = agent.vision.prepare_image(image_path)
+    request = agent.vision._plan_batch_request(["step"] * 20, prepared)
+    assert request["max_tokens"] == MAX_PLAN_TOKENS
+
+
+def test_automate_reports_each_step_as_it_finishes(monkeypatch):
+    """on_step sees finished steps even when a later step is interrupted."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent.actions.wait_until_stable = lambda timeout: 0.0
+    seen = []
+    do = agent.do
+
+    def interrupt_second(command, image_path):
+        if seen:
+            raise KeyboardInterrupt
+        return do(command, image_path)
+
+    agent.do = interrupt_second
+    with pytest.raises(KeyboardInterrupt):
+        agent.automate(["scroll down", "scroll up"], on_step=seen.append)
+    assert [step.command for step in seen] == ["scroll down"]
+
+
+def test_failed_background_save_is_logged(monkeypatch, caplog):
+    """A screenshot that can't be written is reported through logging."""
+    from concurrent.futures import ThreadPoolExecutor
+    from PIL import Image
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    agent = VisionAgent(dry_run=True, verbose=False)
+    agent._screenshot_dir = Path("/nonexistent-dir")
+    capture = Image.new("RGB", (16, 16))
+    monkeypatch.setattr(agent.actions, "capture", lambda: capture)
+
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        assert agent._grab_screen(saver) is capture
+    assert "Could not save screenshot" in caplog.text
+
+
+def test_verbose_shows_progress_under_basic_config(monkeypatch, caplog):
+    """A root logger left at WARNING doesn't hide verbose progress."""
+    import logging
+    from vision_agent import core
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    root = logging.getLogger()
+    levels = core.logger.level, root.level
+    core.logger.setLevel(logging.NOTSET)
+    root.setLevel(logging.WARNING)
+    try:
+        VisionAgent(dry_run=True).scroll("down")
+        assert core.logger.level == logging.INFO
+        assert caplog.messages == ["📜 Scrolling down"]
+    finally:
+        core.logger.setLevel(levels[0])
+        root.setLevel(levels[1])
@@ -0,0 +1,81 @@
+"""CLI module tests."""
+
+import json
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from vision_agent import cli as cli_module
+from vision_agent.cli import cli, get_agent
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    """Provide a fake API key and an empty agent cache."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(cli_module, "_API_KEY", "sk-test")
+    monkeypatch.setattr(cli_module, "_AGENT_CACHE", {})
+
+
+def test_cli():
+    """The CLI module exposes the click group."""
+    assert callable(cli)
+
+
+def test_get_agent_is_memoized(api_key):
+    """Agents are reused per distinct set of kwargs."""
+    agent = get_agent(dry_run=True, verbose=False)
+    assert get_agent(dry_run=True, verbose=False) is agent
+    assert get_agent(dry_run=False, verbose=False) is not agent
+
+
+def test_click_command_dry_run(api_key):
+    """Commands render their result through the lazily created console."""
+    result = CliRunner().invoke(cli, ["click", "10", "20", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "Would click at (10, 20)" in result.output
+
+
+def test_automate_json_log(api_key, tmp_path):
+    """automate --json-log writes one JSON object per step."""
+    log_path = tmp_path / "steps.jsonl"
+
+    result = CliRunner().invoke(
+        cli, ["automate", "scroll down", "--dry-run", "--json-log", str(log_path)]
+    )
+    assert result.exit_code == 0, result.output
+
+    lines = log_path.read_text().splitlines()
+    assert len(lines) == 1
+    step = json.loads(lines[0])
+    assert step["step_number"] == 1
+    assert step["success"]
+    assert step["action_result"]["details"] == "[DRY RUN] Would scroll down by 3"
+
+
+def test_lazy_commands_resolve():
+    """Every listed subcommand can be loaded under its own name."""
+    ctx = click.Context(cli)
+    for name in cli.list_commands(ctx):
+        assert cli.get_command(ctx, name).name == name
+
+
+def test_get_agent_requires_api_key(monkeypatch):
+    """get_agent() exits when no API key was set at startup."""
+    monkeypatch.setattr(cli_module, "_API_KEY", None)
+
+    with pytest.raises(SystemExit):
+        get_agent()
+
+
+def test_automate_json_log_checked_before_running(api_key, tmp_path):
+    """An unwritable --json-log path is rejected before any step runs."""
+    log_path = tmp_path / "missing" / "steps.jsonl"
+
+    result = CliRunner().invoke(
+        cli, ["automate", "scroll down", "--dry-run", "--json-log", str(log_path)]
+    )
+    assert result.exit_code == 2
+    assert "Starting Automation" not in result.output
+    assert cli_module._AGENT_CACHE == {}
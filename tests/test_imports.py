@@ -0,0 +1,34 @@
+"""Import tests for VisionAgent."""
+
+import subprocess
+import sys
+
+try:
+    from vision_agent import VisionAgent, VisionModel, ActionExecutor
+    from vision_agent.vision import ElementLocation, AnalysisResult
+    from vision_agent.actions import ActionResult
+    from vision_agent.cli import cli
+    IMPORTS_OK = True
+    IMPORT_ERROR = None
+except Exception as e:
+    IMPORTS_OK = False
+    IMPORT_ERROR = e
+
+
+def test_imports():
+    """All public modules load."""
+    assert IMPORTS_OK, f"Import failed: {IMPORT_ERROR}"
+
+
+def test_submodule_import_is_selective():
+    """Importing vision_agent.actions doesn't load the vision/core graph."""
+    code = (
+        "import sys, types; "
+        "sys.modules['pyautogui'] = types.ModuleType('pyautogui'); "
+        "import vision_agent.actions; "
+        "print(any(m in sys.modules for m in ('vision_agent.core', 'openai')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,105 @@
+"""Tests for the result data models."""
+
+import dataclasses
+
+import pytest
+
+from vision_agent.vision import ElementLocation, AnalysisResult
+from vision_agent.actions import ActionResult
+
+
+def test_models():
+    """ElementLocation, AnalysisResult and ActionResult behave as expected."""
+    el = ElementLocation(
+        description="Test button",
+        x=100, y=200,
+        width=80, height=30,
+        element_type="button",
+        confidence=0.9
+    )
+    assert el.coordinates == (100, 200)
+    assert el.center == (140, 215)
+
+    result = AnalysisResult(
+        description="Test description",
+        elements=[el],
+        text_content=["Hello"]
+    )
+    assert result.find_element("button") == el
+
+    action = ActionResult(
+        success=True,
+        action="click",
+        details="Clicked at (100, 200)"
+    )
+    assert action.success
+
+
+def test_find_element_matches_first_substring():
+    """Token-index hits don't skip earlier substring matches."""
+    result = AnalysisResult(
+        description="Toolbar",
+        elements=[
+            ElementLocation(description="Cancel", x=0, y=0),
+            ElementLocation(description="Submit buttons row", x=1, y=1),
+            ElementLocation(description="OK button", x=2, y=2),
+        ],
+    )
+    assert result.find_element("button").x == 1
+    assert result.find_element("OK").x == 2
+    assert result.find_element("submit buttons").x == 1
+    assert result.find_element("missing") is None
+    assert AnalysisResult(description="Empty").find_element("ok") is None
+
+
+def test_results_are_frozen():
+    """Result objects can't be modified after construction."""
+    el = ElementLocation(description="OK", x=1, y=2)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        el.x = 5
+    assert not hasattr(el, "__dict__")
+
+    from vision_agent.core import AutomationResult, StepResult
+    step = StepResult(step_number=1, command="scroll down", success=True)
+    result = AutomationResult(
+        success=True, total_steps=1, completed_steps=1, steps=[step], duration_seconds=0.1
+    )
+    assert result.steps == (step,)
+
+
+def test_analysis_elements_cannot_go_stale():
+    """The elements behind the lookup tables can't be reordered or extended."""
+    ok = ElementLocation(description="OK", x=1, y=2)
+    cancel = ElementLocation(description="Cancel", x=3, y=4)
+    elements = [ok, cancel]
+    result = AnalysisResult(description="Dialog", elements=elements, text_content=["OK"])
+
+    elements.reverse()
+    assert result.elements == (ok, cancel)
+    assert result.find_element("ok") is ok
+    assert isinstance(result.text_content, tuple)
+    with pytest.raises(AttributeError):
+        result.elements.append(cancel)
+
+
+def test_spatial_queries():
+    """nearest_element() and elements_at() use element bounding boxes."""
+    panel = ElementLocation(description="Panel", x=0, y=0, width=200, height=200)
+    button = ElementLocation(description="OK", x=50, y=50, width=20, height=10)
+    icon = ElementLocation(description="Icon", x=300, y=300)
+    result = AnalysisResult(description="Dialog", elements=[panel, button, icon])
+
+    assert result.nearest_element(62, 54) == button
+    assert result.nearest_element(290, 310) == icon
+    assert result.elements_at(55, 55) == [panel, button]
+    assert result.elements_at(300, 300) == [icon]
+    assert result.elements_at(500, 500) == []
+    assert AnalysisResult(description="Empty").nearest_element(0, 0) is None
+
+    # With only a width, the element is located at (x, y) like its center
+    bar = ElementLocation(description="Bar", x=0, y=0, width=1000)
+    far = ElementLocation(description="Far", x=400, y=0)
+    result = AnalysisResult(description="Toolbar", elements=[bar, far])
+    assert bar.center == (0, 0)
+    assert result.nearest_element(380, 0) == far
+    assert result.elements_at(500, 0) == []
@@ -0,0 +1,132 @@
+"""Tests for VisionModel using a fake OpenAI client."""
+
+import asyncio
+import base64
+import io
+import json
+import os
+
+from PIL import Image
+
+from vision_agent.vision import AnalysisResult
+
+ANALYSIS = json.dumps({
+    "description": "A login form",
+    "elements": [
+        {"description": "Login button", "type": "button", "x": 10, "y": 20},
+    ],
+    "text_content": ["Login"],
+})
+
+FOUND = json.dumps({
+    "found": True, "description": "Login button", "type": "button",
+    "x": 10, "y": 20, "confidence": 0.9,
+})
+
+
+def test_analyze_parses_elements(make_vision_model, image_path):
+    """analyze() turns the JSON reply into an AnalysisResult."""
+    model = make_vision_model(ANALYSIS)
+
+    result = model.analyze(image_path)
+    assert isinstance(result, AnalysisResult)
+    assert result.description == "A login form"
+    assert result.find_element("login").coordinates == (10, 20)
+
+    content = model.client.chat.completions.calls[0]["messages"][1]["content"]
+    assert content[1]["image_url"]["url"].startswith("data:image/png;base64,")
+
+
+def test_analyze_keeps_non_json_reply(make_vision_model, image_path):
+    """A reply that isn't JSON becomes the description."""
+    result = make_vision_model("not json").analyze(image_path)
+    assert result.description == "not json"
+    assert result.elements == ()
+
+
+def test_async_methods_match_sync(make_vision_model, image_path):
+    """The async variants parse replies the same way."""
+    element = asyncio.run(make_vision_model(FOUND).afind_element("login", image_path))
+    assert element.coordinates == (10, 20)
+
+    plan = json.dumps({"steps": [{"action": "scroll", "value": "down"}]})
+    steps = asyncio.run(make_vision_model(plan).aplan_action("scroll", image_path))
+    assert steps == [{"action": "scroll", "value": "down"}]
+
+
+def test_image_encoding_is_cached(make_vision_model, image_path, monkeypatch):
+    """The same file is encoded once until it changes on disk."""
+    model = make_vision_model(ANALYSIS)
+    reads = []
+    real_open = os.open
+
+    def counting_open(path, *args, **kwargs):
+        if str(path) == str(image_path.resolve()):
+            reads.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "open", counting_open)
+    prepared = model.prepare_image(image_path)
+    assert model.prepare_image(image_path) == prepared
+    assert prepared.media_type == "image/png"
+    assert len(reads) == 1
+
+    image_path.write_bytes(image_path.read_bytes() + b"\0")
+    assert model.prepare_image(image_path).data != prepared.data
+    assert len(reads) == 2
+
+
+def test_in_memory_image_is_encoded_directly(make_vision_model):
+    """A PIL image is sent as PNG without being written to disk."""
+    model = make_vision_model(ANALYSIS)
+    image = Image.new("RGB", (32, 32), "black")
+
+    prepared = model.prepare_image(image)
+    assert prepared.media_type == "image/png"
+    assert base64.b64decode(prepared.data).startswith(b"\x89PNG")
+    assert model.analyze(image).description == "A login form"
+
+
+def test_identical_screenshots_reuse_results(make_vision_model, image_path, tmp_path):
+    """A byte-identical frame skips the API call; misses are retried."""
+    model = make_vision_model(lambda request: FOUND if "login" in str(request) else "{}")
+    calls = model.client.chat.completions.calls
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(image_path.read_bytes())
+
+    first = model.find_element("login", image_path)
+    assert model.find_element("login", copy) is first
+    assert len(calls) == 1
+
+    assert model.find_element("logout", image_path) is None
+    assert model.find_element("logout", image_path) is None
+    assert len(calls) == 3
+
+    model.client.chat.completions.reply = ANALYSIS
+    assert model.analyze(image_path) is model.analyze(copy)
+    assert len(calls) == 4
+
+
+def test_large_screenshot_is_downscaled(make_vision_model, tmp_path):
+    """Oversized screenshots go out as JPEG and coordinates map back."""
+    path = tmp_path / "big.png"
+    Image.new("RGB", (3200, 1800), "white").save(path)
+    model = make_vision_model(FOUND)
+
+    element = model.find_element("login", path)
+    assert (element.x, element.y) == (20, 40)
+
+    url = model.client.chat.completions.calls[0]["messages"][1]["content"][1]["image_url"]["url"]
+    assert url.startswith("data:image/jpeg;base64,")
+    with Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1]))) as sent:
+        assert sent.size == (1600, 900)
+
+
+def test_downscaled_digest_depends_on_shape(make_vision_model):
+    """Frames with the same pixel bytes but different shapes don't share results."""
+    model = make_vision_model(ANALYSIS)
+    data = bytes(3200 * 1800 * 3)
+    wide = Image.frombytes("RGB", (3200, 1800), data)
+    tall = Image.frombytes("RGB", (1800, 3200), data)
+
+    assert model.prepare_image(wide).digest != model.prepare_image(tall).digest
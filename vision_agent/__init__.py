@@ -1,10 +1,17 @@
 """VisionAgent - AI that can see and interact with any UI."""
 
+import importlib
+
 __version__ = "0.1.0"
 
-from .core import VisionAgent
-from .vision import VisionModel, AnalysisResult, ElementLocation
-from .actions import ActionExecutor
+# Public name -> submodule that defines it, imported on first access
+_LAZY = {
+    "VisionAgent": ".core",
+    "VisionModel": ".vision",
+    "AnalysisResult": ".vision",
+    "ElementLocation": ".vision",
+    "ActionExecutor": ".actions",
+}
 
 __all__ = [
     "VisionAgent",
@@ -13,3 +20,16 @@ __all__ = [
     "ElementLocation",
     "ActionExecutor",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,31 @@
+"""Point queries over element bounding boxes.
+
+Boxes are ``(x, y, width, height)`` tuples with ``(x, y)`` at the top-left,
+matching ``ElementLocation``. Elements without both a width and a height
+get zero for each, so their box is just the point itself and its center
+agrees with ``ElementLocation.center``.
+"""
+
+from typing import Sequence
+
+Box = tuple[int, int, int, int]
+
+
+def nearest(boxes: Sequence[Box], px: int, py: int) -> int:
+    """Index of the box whose center is closest to (px, py), or -1 if none."""
+    best, best_dist = -1, None
+    for i, (x, y, w, h) in enumerate(boxes):
+        dx = x + w // 2 - px
+        dy = y + h // 2 - py
+        dist = dx * dx + dy * dy
+        if best_dist is None or dist < best_dist:
+            best, best_dist = i, dist
+    return best
+
+
+def containing(boxes: Sequence[Box], px: int, py: int) -> list[int]:
+    """Indices of the boxes that contain (px, py), edges included."""
+    return [
+        i for i, (x, y, w, h) in enumerate(boxes)
+        if x <= px <= x + w and y <= py <= y + h
+    ]
@@ -1,8 +1,13 @@
 """Action executors for interacting with the screen."""
 
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
 import time
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Optional, Literal, Union
 from pathlib import Path
 
 # Try to import automation libraries
@@ -12,14 +17,36 @@ try:
 except ImportError:
     PYAUTOGUI_AVAILABLE = False
 
+try:
+    import pyperclip
+    PYPERCLIP_AVAILABLE = True
+except ImportError:
+    PYPERCLIP_AVAILABLE = False
+
 try:
     from PIL import Image
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
 
+# Modifier key used with "v" to paste from the clipboard
+PASTE_MODIFIER = "command" if sys.platform == "darwin" else "ctrl"
+# Seconds to let the target app read the clipboard before it is restored
+_PASTE_SETTLE = 0.1
+
+# Key names pyautogui understands; empty means keys aren't checked
+_VALID_KEYS = frozenset(getattr(pyautogui, "KEYBOARD_KEYS", ())) if PYAUTOGUI_AVAILABLE else frozenset()
+
 
-@dataclass
+def _invalid_keys(keys: tuple[str, ...]) -> list[str]:
+    """Return the key names pyautogui doesn't know, if it can tell."""
+    if not _VALID_KEYS:
+        return []
+    # Like pyautogui, single characters are taken as-is and names are case-insensitive
+    return [k for k in keys if len(k) > 1 and k.lower() not in _VALID_KEYS]
+
+
+@dataclass(slots=True)
 class ActionResult:
     """Result of executing an action."""
     success: bool
@@ -28,6 +55,30 @@ class ActionResult:
     error: Optional[str] = None
 
 
+def _ok(action: str, details: str) -> ActionResult:
+    """Build a successful ActionResult."""
+    return ActionResult(success=True, action=action, details=details)
+
+
+def _dry(action: str, details: str) -> ActionResult:
+    """Build the ActionResult for an action skipped in dry-run mode."""
+    return ActionResult(success=True, action=action, details=f"[DRY RUN] {details}")
+
+
+def _fail(
+    action: str,
+    details: str,
+    error: Optional[Union[str, Exception]] = None
+) -> ActionResult:
+    """Build a failed ActionResult."""
+    return ActionResult(
+        success=False,
+        action=action,
+        details=details,
+        error=None if error is None else str(error)
+    )
+
+
 class ActionExecutor:
     """Executes UI actions like clicking, typing, and scrolling."""
     
@@ -36,45 +87,155 @@ class ActionExecutor:
         click_delay: float = 0.3,
         type_delay: float = 0.02,
         dry_run: bool = False,
-        confirm: bool = False
+        confirm: bool = False,
+        paste_threshold: Optional[int] = 50,
+        screenshot_ttl: float = 0.5
     ):
         self.click_delay = click_delay
         self.type_delay = type_delay
+        self.paste_threshold = paste_threshold
+        self.screenshot_ttl = screenshot_ttl
+        # (monotonic timestamp, path) of the last screenshot written to disk;
+        # cleared by every action that may change the screen
+        self._last_shot: Optional[tuple[float, str]] = None
         self.dry_run = dry_run
         self.confirm = confirm
+        # Number of upcoming confirmations already approved via approve_plan()
+        self._approved_through = 0
+        # Seconds the last settle-check screen grab took; None until measured
+        self._grab_cost: Optional[float] = None
         
         if not PYAUTOGUI_AVAILABLE and not dry_run:
             print("Warning: pyautogui not installed. Actions will be simulated.")
             self.dry_run = True
         
+        # Scroll function and sign per direction
+        self._scroll_fns = {}
+        
         # Configure pyautogui safety
         if PYAUTOGUI_AVAILABLE:
             pyautogui.FAILSAFE = True  # Move mouse to corner to abort
             pyautogui.PAUSE = 0.1
+            self._scroll_fns = {
+                "up": (pyautogui.scroll, 1),
+                "down": (pyautogui.scroll, -1),
+                "left": (pyautogui.hscroll, -1),
+                "right": (pyautogui.hscroll, 1),
+            }
+        
+        # Bound methods keyed by action name, used by execute()
+        self._dispatch = {
+            "click": self.click,
+            "double_click": self.double_click,
+            "right_click": self.right_click,
+            "type": self.type_text,
+            "press": self.press_key,
+            "hotkey": self.hotkey,
+            "scroll": self.scroll,
+            "move_to": self.move_to,
+            "drag": self.drag_to,
+            "wait": self.wait,
+        }
+    
+    def execute(self, action_name: str, *args, **kwargs) -> ActionResult:
+        """Execute an action by name, e.g. ``execute("scroll", "up", 5)``."""
+        method = self._dispatch.get(action_name)
+        if method is None:
+            return _fail(action_name, f"Unknown action: {action_name}", "Unknown action")
+        return method(*args, **kwargs)
     
     def _confirm_action(self, action: str) -> bool:
         """Ask user to confirm action."""
         if not self.confirm:
             return True
+        if self._approved_through > 0:
+            self._approved_through -= 1
+            return True
         response = input(f"Execute '{action}'? [y/N]: ")
         return response.lower() in ("y", "yes")
     
+    def approve_plan(self, steps: list[str]) -> int:
+        """Ask the user once to approve a whole list of steps.
+        
+        On approval, the next ``len(steps)`` actions run without asking.
+        Returns the number of approved steps (0 if declined, in which case
+        each action is confirmed individually as usual).
+        """
+        if not self.confirm or self.dry_run:
+            return len(steps)
+        
+        print("Planned steps:")
+        for i, step in enumerate(steps, 1):
+            print(f"  {i}. {step}")
+        response = input(f"Execute all {len(steps)} steps? [y/N]: ")
+        
+        self._approved_through = len(steps) if response.lower() in ("y", "yes") else 0
+        return self._approved_through
+    
+    def revoke_approval(self):
+        """Drop any approval left over from approve_plan()."""
+        self._approved_through = 0
+    
+    def _should_paste(self, text: str) -> bool:
+        """Check if text should be pasted from the clipboard instead of typed.
+        
+        Long printable-ASCII strings are pasted so typing time doesn't grow
+        with the length of the text. Set ``paste_threshold`` to None (or
+        pass ``paste=False`` to type_text()) to always type character by
+        character.
+        """
+        return (
+            PYPERCLIP_AVAILABLE
+            and self.paste_threshold is not None
+            and len(text) > self.paste_threshold
+            and text.isascii()
+            and text.isprintable()
+        )
+    
     def screenshot(self, save_path: Optional[str] = None) -> Optional[str]:
-        """Take a screenshot."""
+        """Take a screenshot.
+        
+        Without ``save_path``, the image goes to a new file in the system
+        temp directory. A screenshot taken less than ``screenshot_ttl``
+        seconds ago, with no action performed since, is reused instead of
+        grabbing and encoding the screen again. If a different ``save_path``
+        is requested, the cached file is copied there.
+        """
         if not PYAUTOGUI_AVAILABLE:
             return None
         
-        if save_path is None:
-            save_path = f"screenshot_{int(time.time())}.png"
-        
         if self.dry_run:
-            print(f"[DRY RUN] Would save screenshot to: {save_path}")
+            print(f"[DRY RUN] Would save screenshot to: {save_path or 'a temporary file'}")
             return save_path
         
+        if save_path is None:
+            # mkstemp creates the file with O_EXCL, so bursts never collide
+            fd, save_path = tempfile.mkstemp(prefix="screenshot_", suffix=".png")
+            os.close(fd)
+        
+        now = time.monotonic()
+        if self._last_shot is not None:
+            shot_time, shot_path = self._last_shot
+            if now - shot_time < self.screenshot_ttl and Path(shot_path).exists():
+                if shot_path != save_path:
+                    shutil.copyfile(shot_path, save_path)
+                return save_path
+        
         screenshot = pyautogui.screenshot()
-        screenshot.save(save_path)
+        # Low zlib effort: full-screen captures encode several times faster
+        screenshot.save(save_path, compress_level=1)
+        self._last_shot = (now, save_path)
         return save_path
     
+    def capture(self) -> Optional["Image.Image"]:
+        """Grab the screen as an in-memory PIL image without saving it.
+        
+        Returns None in dry-run mode or when pyautogui isn't available.
+        """
+        if not PYAUTOGUI_AVAILABLE or self.dry_run:
+            return None
+        return pyautogui.screenshot()
+    
     def click(
         self,
         x: int,
@@ -86,34 +247,18 @@ class ActionExecutor:
         action = f"click({x}, {y}, button={button}, clicks={clicks})"
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would click at ({x}, {y})"
-            )
+            return _dry(action, f"Would click at ({x}, {y})")
         
         if not self._confirm_action(action):
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Action cancelled by user"
-            )
+            return _fail(action, "Action cancelled by user")
         
+        self._last_shot = None
         try:
             pyautogui.click(x, y, clicks=clicks, button=button)
             time.sleep(self.click_delay)
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Clicked at ({x}, {y})"
-            )
+            return _ok(action, f"Clicked at ({x}, {y})")
         except Exception as e:
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Click failed",
-                error=str(e)
-            )
+            return _fail(action, "Click failed", e)
     
     def double_click(self, x: int, y: int) -> ActionResult:
         """Double-click at coordinates."""
@@ -126,101 +271,90 @@ class ActionExecutor:
     def type_text(
         self,
         text: str,
-        interval: Optional[float] = None
+        interval: Optional[float] = None,
+        paste: bool = True
     ) -> ActionResult:
-        """Type text."""
+        """Type text.
+        
+        Long text may be pasted through the clipboard (see _should_paste);
+        the user's clipboard contents are put back afterwards, so neither
+        they nor the pasted text are left behind. Pass ``paste=False`` to
+        keep the text off the clipboard entirely, e.g. for passwords.
+        """
         action = f"type({repr(text[:30])}{'...' if len(text) > 30 else ''})"
         interval = interval or self.type_delay
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would type: {text[:50]}..."
-            )
+            return _dry(action, f"Would type: {text[:50]}...")
         
         if not self._confirm_action(action):
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Action cancelled by user"
-            )
+            return _fail(action, "Action cancelled by user")
         
+        self._last_shot = None
         try:
+            if paste and self._should_paste(text):
+                self._paste(text)
+                return _ok(action, f"Pasted {len(text)} characters")
+            
             pyautogui.typewrite(text, interval=interval)
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Typed {len(text)} characters"
-            )
-        except Exception as e:
+            return _ok(action, f"Typed {len(text)} characters")
+        except Exception:
             # Fall back to write for special characters
             try:
                 pyautogui.write(text)
-                return ActionResult(
-                    success=True,
-                    action=action,
-                    details=f"Typed {len(text)} characters (write mode)"
-                )
-            except Exception as e2:
-                return ActionResult(
-                    success=False,
-                    action=action,
-                    details="Type failed",
-                    error=str(e2)
-                )
+                return _ok(action, f"Typed {len(text)} characters (write mode)")
+            except Exception as e:
+                return _fail(action, "Type failed", e)
+    
+    def _paste(self, text: str):
+        """Paste text via the clipboard, then restore what was there before."""
+        try:
+            previous = pyperclip.paste()
+        except pyperclip.PyperclipException:
+            # Unreadable clipboard: clear it afterwards rather than leave the text
+            previous = ""
+        pyperclip.copy(text)
+        try:
+            pyautogui.hotkey(PASTE_MODIFIER, "v")
+            time.sleep(_PASTE_SETTLE)
+        finally:
+            pyperclip.copy(previous)
     
     def press_key(self, key: str) -> ActionResult:
         """Press a keyboard key."""
         action = f"press({key})"
         
+        if _invalid_keys((key,)):
+            return _fail(action, "Key press failed", f"Unknown key: {key}")
+        
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would press: {key}"
-            )
+            return _dry(action, f"Would press: {key}")
         
+        self._last_shot = None
         try:
             pyautogui.press(key)
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Pressed {key}"
-            )
+            return _ok(action, f"Pressed {key}")
         except Exception as e:
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Key press failed",
-                error=str(e)
-            )
+            return _fail(action, "Key press failed", e)
     
     def hotkey(self, *keys: str) -> ActionResult:
         """Press a key combination."""
         action = f"hotkey({', '.join(keys)})"
+        combo = "+".join(keys)
+        
+        invalid = _invalid_keys(keys)
+        if invalid:
+            return _fail(action, "Hotkey failed", f"Unknown key: {', '.join(invalid)}")
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would press: {'+'.join(keys)}"
-            )
+            return _dry(action, f"Would press: {combo}")
         
+        self._last_shot = None
         try:
             pyautogui.hotkey(*keys)
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Pressed {'+'.join(keys)}"
-            )
+            return _ok(action, f"Pressed {combo}")
         except Exception as e:
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Hotkey failed",
-                error=str(e)
-            )
+            return _fail(action, "Hotkey failed", e)
     
     def scroll(
         self,
@@ -231,60 +365,33 @@ class ActionExecutor:
         action = f"scroll({direction}, {amount})"
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would scroll {direction} by {amount}"
-            )
+            return _dry(action, f"Would scroll {direction} by {amount}")
         
         try:
-            if direction == "up":
-                pyautogui.scroll(amount)
-            elif direction == "down":
-                pyautogui.scroll(-amount)
-            elif direction == "left":
-                pyautogui.hscroll(-amount)
-            elif direction == "right":
-                pyautogui.hscroll(amount)
-            
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Scrolled {direction} by {amount}"
-            )
+            scroll_fn, sign = self._scroll_fns[direction]
+        except KeyError:
+            return _fail(action, "Scroll failed", f"Unknown direction: {direction}")
+        
+        self._last_shot = None
+        try:
+            scroll_fn(sign * amount)
+            return _ok(action, f"Scrolled {direction} by {amount}")
         except Exception as e:
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Scroll failed",
-                error=str(e)
-            )
+            return _fail(action, "Scroll failed", e)
     
     def move_to(self, x: int, y: int, duration: float = 0.2) -> ActionResult:
         """Move mouse to coordinates."""
         action = f"move_to({x}, {y})"
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would move to ({x}, {y})"
-            )
+            return _dry(action, f"Would move to ({x}, {y})")
         
+        self._last_shot = None
         try:
             pyautogui.moveTo(x, y, duration=duration)
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Moved to ({x}, {y})"
-            )
+            return _ok(action, f"Moved to ({x}, {y})")
         except Exception as e:
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Move failed",
-                error=str(e)
-            )
+            return _fail(action, "Move failed", e)
     
     def drag_to(
         self,
@@ -298,45 +405,77 @@ class ActionExecutor:
         action = f"drag({start_x}, {start_y}) -> ({end_x}, {end_y})"
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would drag from ({start_x}, {start_y}) to ({end_x}, {end_y})"
+            return _dry(
+                action,
+                f"Would drag from ({start_x}, {start_y}) to ({end_x}, {end_y})"
             )
         
+        self._last_shot = None
         try:
             pyautogui.moveTo(start_x, start_y)
             pyautogui.drag(end_x - start_x, end_y - start_y, duration=duration)
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"Dragged to ({end_x}, {end_y})"
-            )
+            return _ok(action, f"Dragged to ({end_x}, {end_y})")
         except Exception as e:
-            return ActionResult(
-                success=False,
-                action=action,
-                details="Drag failed",
-                error=str(e)
-            )
+            return _fail(action, "Drag failed", e)
     
     def wait(self, seconds: float) -> ActionResult:
         """Wait for a specified time."""
         action = f"wait({seconds}s)"
         
         if self.dry_run:
-            return ActionResult(
-                success=True,
-                action=action,
-                details=f"[DRY RUN] Would wait {seconds}s"
-            )
+            return _dry(action, f"Would wait {seconds}s")
         
+        self._last_shot = None
         time.sleep(seconds)
-        return ActionResult(
-            success=True,
-            action=action,
-            details=f"Waited {seconds}s"
-        )
+        return _ok(action, f"Waited {seconds}s")
+    
+    def wait_until_stable(
+        self,
+        timeout: float = 0.5,
+        interval: float = 0.05,
+        stable_polls: int = 2
+    ) -> float:
+        """Wait for the screen to stop changing, for about ``timeout`` seconds at most.
+        
+        A small grayscale thumbnail of the screen is hashed every ``interval``
+        seconds; once it is unchanged for ``stable_polls`` polls in a row the
+        UI is taken to have settled. Polls are timed, and one that wouldn't
+        finish before the deadline isn't started; where grabbing the screen
+        is too slow for even one comparison within ``timeout``, this just
+        sleeps. Only the first grab, before its cost is known, can overrun.
+        Without a way to look at the screen (or in dry-run mode) this also
+        just sleeps for ``timeout``. Returns the time spent waiting.
+        """
+        start = time.monotonic()
+        if (
+            self.dry_run
+            or not (PYAUTOGUI_AVAILABLE and PIL_AVAILABLE)
+            or (self._grab_cost is not None and 2 * self._grab_cost + interval > timeout)
+        ):
+            time.sleep(timeout)
+            return time.monotonic() - start
+        
+        deadline = start + timeout
+        previous = self._screen_hash()
+        stable = 0
+        while stable < stable_polls:
+            remaining = deadline - time.monotonic()
+            if remaining < interval + self._grab_cost:
+                # Another poll would end past the deadline
+                time.sleep(max(remaining, 0))
+                break
+            time.sleep(interval)
+            current = self._screen_hash()
+            stable = stable + 1 if current == previous else 0
+            previous = current
+        return time.monotonic() - start
+    
+    def _screen_hash(self) -> bytes:
+        """Hash a 160x90 grayscale thumbnail of the screen, timing the grab."""
+        start = time.monotonic()
+        thumb = pyautogui.screenshot().convert("L").resize((160, 90))
+        self._grab_cost = time.monotonic() - start
+        return hashlib.blake2b(thumb.tobytes(), digest_size=16).digest()
     
     def get_screen_size(self) -> tuple[int, int]:
         """Get screen dimensions."""
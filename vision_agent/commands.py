@@ -0,0 +1,196 @@
+"""Subcommands for the VisionAgent CLI.
+
+These are loaded by ``vision_agent.cli.cli`` the first time a command is
+looked up, so importing ``vision_agent.cli`` doesn't build them.
+"""
+
+import json
+from dataclasses import asdict
+from itertools import islice
+
+import click
+
+from .cli import _get_console, get_agent
+
+
+@click.command()
+@click.argument("image_path", type=click.Path(exists=True))
+def analyze(image_path):
+    """Analyze a screenshot and describe its contents."""
+    from rich.panel import Panel
+    
+    console = _get_console()
+    agent = get_agent()
+    result = agent.analyze(image_path)
+    
+    console.print(Panel.fit(f"[bold blue]📸 Analysis: {image_path}[/bold blue]"))
+    console.print(f"\n{result.description}\n")
+    
+    if result.elements:
+        console.print("[bold]Interactive Elements:[/bold]")
+        for i, el in enumerate(islice(result.elements, 10), 1):
+            console.print(f"  {i}. [{el.element_type}] {el.description} at ({el.x}, {el.y})")
+
+
+@click.command()
+@click.argument("description")
+@click.option("--screenshot", "-s", type=click.Path(exists=True), help="Screenshot to search in")
+def find(description, screenshot):
+    """Find a specific element on screen."""
+    console = _get_console()
+    agent = get_agent()
+    
+    if not screenshot:
+        console.print("📸 Taking screenshot...")
+        screenshot = agent._take_screenshot()
+    
+    element = agent.find_element(description, screenshot)
+    
+    if element:
+        console.print(f"[green]✅ Found![/green]")
+        console.print(f"   Element: {element.description}")
+        console.print(f"   Type: {element.element_type}")
+        console.print(f"   Location: ({element.x}, {element.y})")
+        console.print(f"   Confidence: {element.confidence*100:.0f}%")
+    else:
+        console.print(f"[red]❌ Element not found: {description}[/red]")
+
+
+@click.command("click")
+@click.argument("x", type=int)
+@click.argument("y", type=int)
+@click.option("--dry-run", is_flag=True, help="Don't actually click")
+def click_cmd(x, y, dry_run):
+    """Click at coordinates."""
+    console = _get_console()
+    agent = get_agent(dry_run=dry_run)
+    result = agent.click(x, y)
+    
+    if result.success:
+        console.print(f"[green]✅ {result.details}[/green]")
+    else:
+        console.print(f"[red]❌ {result.details}[/red]")
+
+
+@click.command("type")
+@click.argument("text")
+@click.option("--dry-run", is_flag=True, help="Don't actually type")
+def type_cmd(text, dry_run):
+    """Type text."""
+    console = _get_console()
+    agent = get_agent(dry_run=dry_run)
+    result = agent.type_text(text)
+    
+    if result.success:
+        console.print(f"[green]✅ {result.details}[/green]")
+    else:
+        console.print(f"[red]❌ {result.details}[/red]")
+
+
+@click.command()
+@click.argument("direction", type=click.Choice(["up", "down", "left", "right"]))
+@click.option("--amount", "-a", default=3, help="Scroll amount")
+@click.option("--dry-run", is_flag=True, help="Don't actually scroll")
+def scroll(direction, amount, dry_run):
+    """Scroll the screen."""
+    console = _get_console()
+    agent = get_agent(dry_run=dry_run)
+    result = agent.scroll(direction, amount)
+    
+    if result.success:
+        console.print(f"[green]✅ {result.details}[/green]")
+    else:
+        console.print(f"[red]❌ {result.details}[/red]")
+
+
+@click.command()
+@click.argument("command")
+@click.option("--dry-run", is_flag=True, help="Don't execute actions")
+def do(command, dry_run):
+    """Execute a natural language command."""
+    console = _get_console()
+    agent = get_agent(dry_run=dry_run)
+    
+    console.print(f"🤖 Executing: {command}\n")
+    result = agent.do(command)
+    
+    if result.success:
+        console.print(f"[green]✅ {result.details}[/green]")
+    else:
+        console.print(f"[red]❌ {result.details}[/red]")
+        if result.error:
+            console.print(f"[dim]Error: {result.error}[/dim]")
+
+
+def _write_json_step(f, step):
+    """Append one step result to f as a JSON line, flushed straight away."""
+    f.write(json.dumps(asdict(step), ensure_ascii=False))
+    f.write("\n")
+    f.flush()
+
+
+@click.command()
+@click.argument("steps")
+@click.option("--dry-run", is_flag=True, help="Don't execute actions")
+@click.option("--json-log", type=click.File("w", encoding="utf-8", lazy=False), help="Write step results as JSON lines to this file, one per finished step")
+@click.option("--batch-size", type=click.IntRange(1, 8), default=1, show_default=True, help="Plan up to this many consecutive steps in one request (max 8)")
+def automate(steps, dry_run, json_log, batch_size):
+    """Run multi-step automation.
+    
+    Steps can be provided as a quoted string with numbered items:
+    "1. Click the login button
+     2. Type 'username' in the field
+     3. Click submit"
+    """
+    from rich.panel import Panel
+    
+    console = _get_console()
+    agent = get_agent(dry_run=dry_run)
+    
+    console.print(Panel.fit("[bold blue]🤖 Starting Automation[/bold blue]"))
+    # The log file is opened by click before anything runs
+    on_step = (lambda step: _write_json_step(json_log, step)) if json_log else None
+    result = agent.automate(steps, batch_size=batch_size, on_step=on_step)
+    
+    console.print(f"\n[bold]Results:[/bold]")
+    console.print(f"  Total steps: {result.total_steps}")
+    console.print(f"  Completed: {result.completed_steps}")
+    console.print(f"  Duration: {result.duration_seconds:.1f}s")
+    
+    if json_log:
+        console.print(f"  Step log: {json_log.name}")
+    
+    if result.success:
+        console.print(f"\n[green]✅ All steps completed successfully![/green]")
+    else:
+        console.print(f"\n[yellow]⚠️ Some steps failed[/yellow]")
+        for step in result.steps:
+            if not step.success:
+                console.print(f"  - Step {step.step_number}: {step.error}")
+
+
+@click.command()
+@click.option("--dry-run", is_flag=True, help="Don't execute actions")
+def interactive(dry_run):
+    """Start interactive mode."""
+    from rich.panel import Panel
+    
+    console = _get_console()
+    agent = get_agent(dry_run=dry_run)
+    
+    console.print(Panel.fit(
+        "[bold blue]👁️ VisionAgent Interactive Mode[/bold blue]\n"
+        "Commands: screenshot, analyze, find, click, type, do, quit",
+        border_style="blue"
+    ))
+    
+    agent.interactive()
+
+
+@click.command()
+def screenshot():
+    """Take a screenshot."""
+    console = _get_console()
+    agent = get_agent()
+    path = agent._take_screenshot()
+    console.print(f"[green]📸 Screenshot saved: {path}[/green]")
@@ -1,15 +1,53 @@
 """Core VisionAgent class that combines vision and actions."""
 
+import asyncio
+import functools
+import logging
+import re
+import sys
 import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Union, List
+from typing import Callable, Optional, Union, List
 from dataclasses import dataclass
 
-from .vision import VisionModel, AnalysisResult, ElementLocation
+from .vision import VisionModel, AnalysisResult, ElementLocation, ImageSource
 from .actions import ActionExecutor, ActionResult
 
+logger = logging.getLogger("vision_agent")
 
-@dataclass
+# Text in single or double quotes, e.g. the value in "type 'hello'"
+_QUOTED = re.compile(r"['\"](.+?)['\"]")
+# Separators between steps of a multi-line script: numbered items, bullets or newlines
+_SPLIT_CMDS = re.compile(r'\n\s*\d+\.\s*|\n\s*-\s*|\n')
+# Most commands automate() plans in one request
+MAX_BATCH_SIZE = 8
+
+
+def _enable_console_logging():
+    """Make sure verbose progress messages are shown.
+    
+    An unset level becomes INFO, so a root logger left at WARNING (e.g. by
+    logging.basicConfig()) doesn't hide them. A stdout handler is added
+    only if neither this logger nor the root logger has one.
+    """
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    if logger.handlers or logging.getLogger().handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+
+
+def _report_failed_save(path: Path, future: Future):
+    """Log a screenshot that couldn't be written in the background."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Could not save screenshot %s: %s", path, future.exception())
+
+
+@dataclass(slots=True, frozen=True)
 class StepResult:
     """Result of executing a single step."""
     step_number: int
@@ -20,14 +58,22 @@ class StepResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AutomationResult:
-    """Result of a multi-step automation."""
+    """Result of a multi-step automation.
+    
+    ``steps`` is stored as a tuple, so the result can't be changed after
+    construction.
+    """
     success: bool
     total_steps: int
     completed_steps: int
-    steps: List[StepResult]
+    steps: tuple[StepResult, ...]
     duration_seconds: float
+    
+    def __post_init__(self):
+        # Frozen dataclass: bypass __setattr__ to store the tuple
+        object.__setattr__(self, "steps", tuple(self.steps))
 
 
 class VisionAgent:
@@ -39,113 +85,216 @@ class VisionAgent:
         model: str = "gpt-4o",
         dry_run: bool = False,
         confirm: bool = False,
-        verbose: bool = True
+        verbose: bool = True,
+        save_screenshots: bool = True
     ):
         self.vision = VisionModel(provider=provider, model=model)
         self.actions = ActionExecutor(dry_run=dry_run, confirm=confirm)
         self.dry_run = dry_run
         self.verbose = verbose
+        if verbose:
+            _enable_console_logging()
+        self.save_screenshots = save_screenshots
         self._screenshot_counter = 0
+        self._screenshot_dir = Path(".")
+        self._path_tmpl = "va_screenshot_{:03d}.png".format
     
-    def _log(self, message: str):
-        """Print message if verbose mode is on."""
+    def _log(self, message: str, *args):
+        """Log a progress message if verbose mode is on.
+        
+        ``args`` are %-formatted into ``message`` only if it is emitted.
+        """
         if self.verbose:
-            print(message)
+            logger.info(message, *args)
+    
+    def _log_enabled(self) -> bool:
+        """Whether _log() would emit; guards arguments that are costly to build."""
+        return self.verbose and logger.isEnabledFor(logging.INFO)
+    
+    def _next_screenshot_path(self) -> Path:
+        """Path for the next numbered screenshot."""
+        self._screenshot_counter += 1
+        return self._screenshot_dir / self._path_tmpl(self._screenshot_counter)
     
     def _take_screenshot(self) -> str:
         """Take and save a screenshot."""
-        self._screenshot_counter += 1
-        path = f"va_screenshot_{self._screenshot_counter:03d}.png"
-        self.actions.screenshot(path)
-        return path
+        path = str(self._next_screenshot_path())
+        return self.actions.screenshot(path) or path
+    
+    def _grab_screen(self, saver: Optional[Executor] = None) -> ImageSource:
+        """Capture the screen for the vision model.
+        
+        With ``save_screenshots`` off, the capture stays in memory and is
+        encoded without a disk round-trip. Given a ``saver`` executor, the
+        capture is also used in memory while the file is written in the
+        background. Otherwise (and in dry-run mode, where nothing is
+        captured) it is saved to a file as before.
+        """
+        if not self.save_screenshots or saver is not None:
+            image = self.actions.capture()
+            if image is not None:
+                if self.save_screenshots:
+                    path = self._next_screenshot_path()
+                    future = saver.submit(image.save, path, compress_level=1)
+                    future.add_done_callback(functools.partial(_report_failed_save, path))
+                return image
+        return self._take_screenshot()
     
-    def analyze(self, image_path: Union[str, Path]) -> AnalysisResult:
+    def analyze(self, image_path: ImageSource) -> AnalysisResult:
         """Analyze a screenshot and describe its contents."""
-        self._log(f"📸 Analyzing: {image_path}")
+        self._log("📸 Analyzing: %s", image_path)
         result = self.vision.analyze(image_path)
-        self._log(f"📝 Found {len(result.elements)} elements")
+        self._log("📝 Found %d elements", len(result.elements))
         return result
     
     def find_element(
         self,
         description: str,
-        image_path: Optional[Union[str, Path]] = None
+        image_path: Optional[ImageSource] = None
     ) -> Optional[ElementLocation]:
         """Find a specific element on screen."""
         if image_path is None:
             self._log("📸 Taking screenshot...")
-            image_path = self._take_screenshot()
+            image_path = self._grab_screen()
         
-        self._log(f"🔍 Searching for: {description}")
+        self._log("🔍 Searching for: %s", description)
         element = self.vision.find_element(description, image_path)
         
         if element:
-            self._log(f"✅ Found at ({element.x}, {element.y})")
+            self._log("✅ Found at (%s, %s)", element.x, element.y)
         else:
             self._log("❌ Element not found")
         
         return element
     
+    def find_elements(
+        self,
+        descriptions: List[str],
+        image_path: Optional[ImageSource] = None,
+        max_concurrency: int = 4
+    ) -> List[Optional[ElementLocation]]:
+        """Find several elements on one screenshot with concurrent requests.
+        
+        Results are returned in the same order as ``descriptions``.
+        """
+        if image_path is None:
+            self._log("📸 Taking screenshot...")
+            image_path = self._grab_screen()
+        
+        self._log("🔍 Searching for %d elements", len(descriptions))
+        image_path = self.vision.prepare_image(image_path)
+        
+        async def find_all():
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def find_one(description):
+                async with semaphore:
+                    return await self.vision.afind_element(description, image_path)
+            
+            try:
+                return await asyncio.gather(*(find_one(d) for d in descriptions))
+            finally:
+                # Its connections can't outlive this run's event loop
+                await self.vision.aclose()
+        
+        elements = asyncio.run(find_all())
+        if self._log_enabled():
+            self._log("✅ Found %d/%d", sum(el is not None for el in elements), len(elements))
+        return list(elements)
+    
     def click(self, x: int, y: int, **kwargs) -> ActionResult:
         """Click at coordinates."""
-        self._log(f"🖱️ Clicking at ({x}, {y})")
+        self._log("🖱️ Clicking at (%s, %s)", x, y)
         return self.actions.click(x, y, **kwargs)
     
     def type_text(self, text: str, **kwargs) -> ActionResult:
         """Type text."""
-        self._log(f"⌨️ Typing: {text[:30]}{'...' if len(text) > 30 else ''}")
+        if self._log_enabled():
+            self._log("⌨️ Typing: %s%s", text[:30], "..." if len(text) > 30 else "")
         return self.actions.type_text(text, **kwargs)
     
     def scroll(self, direction: str = "down", amount: int = 3) -> ActionResult:
         """Scroll the screen."""
-        self._log(f"📜 Scrolling {direction}")
+        self._log("📜 Scrolling %s", direction)
         return self.actions.scroll(direction, amount)
     
-    def do(self, command: str, image_path: Optional[str] = None) -> ActionResult:
-        """Execute a natural language command."""
-        self._log(f"🤖 Command: {command}")
+    def do(self, command: str, image_path: Optional[ImageSource] = None) -> ActionResult:
+        """Execute a natural language command.
+        
+        Commands starting with "click", "type"/"enter" or "scroll" are
+        handled directly; anything else is planned by the vision model.
+        """
+        self._log("🤖 Command: %s", command)
         
         # Take screenshot if not provided
         if image_path is None:
             self._log("📸 Taking screenshot...")
-            image_path = self._take_screenshot()
+            image_path = self._grab_screen()
         
-        # Parse the command
-        command_lower = command.lower()
-        
-        # Simple command parsing
-        if command_lower.startswith("click"):
-            # Try to find element to click
-            target = command.replace("click", "").replace("Click", "").strip()
-            if target:
-                element = self.find_element(target, image_path)
-                if element:
-                    return self.click(element.x, element.y)
-                else:
-                    return ActionResult(
-                        success=False,
-                        action=command,
-                        details=f"Could not find: {target}",
-                        error="Element not found"
-                    )
+        intent, _, rest = command.strip().partition(" ")
+        handler = self._INTENTS.get(intent.lower())
+        if handler is not None:
+            result = handler(self, command, rest.strip(), image_path)
+            if result is not None:
+                return result
         
-        elif "type" in command_lower or "enter" in command_lower:
-            # Extract text to type
-            import re
-            match = re.search(r"['\"](.+?)['\"]", command)
-            if match:
-                text = match.group(1)
-                return self.type_text(text)
-        
-        elif "scroll" in command_lower:
-            if "up" in command_lower:
-                return self.scroll("up")
-            else:
-                return self.scroll("down")
+        return self._do_plan(command, image_path)
+    
+    def _do_click(self, command: str, target: str, image_path: ImageSource) -> Optional[ActionResult]:
+        """Handle "click <element>"."""
+        if not target:
+            return None
+        element = self.find_element(target, image_path)
+        if element:
+            return self.click(element.x, element.y)
+        return ActionResult(
+            success=False,
+            action=command,
+            details=f"Could not find: {target}",
+            error="Element not found"
+        )
+    
+    def _do_type(self, command: str, rest: str, image_path: ImageSource) -> Optional[ActionResult]:
+        """Handle "type '<text>'" / "enter '<text>'"."""
+        match = _QUOTED.search(rest)
+        if match:
+            return self.type_text(match.group(1))
+        return None
+    
+    def _do_scroll(self, command: str, rest: str, image_path: ImageSource) -> Optional[ActionResult]:
+        """Handle "scroll up" / "scroll down"."""
+        return self.scroll("up" if "up" in rest.lower().split() else "down")
+    
+    # Command prefix -> handler; a handler returning None falls back to planning
+    _INTENTS = {
+        "click": _do_click,
+        "type": _do_type,
+        "enter": _do_type,
+        "scroll": _do_scroll,
+    }
+    
+    def _needs_plan(self, command: str) -> bool:
+        """Whether do() sends this command to the planner rather than a handler."""
+        intent = command.strip().partition(" ")[0]
+        return intent.lower() not in self._INTENTS
+    
+    def _do_plan(
+        self,
+        command: str,
+        image_path: ImageSource,
+        steps: Optional[list[dict]] = None
+    ) -> ActionResult:
+        """Plan a command with the vision model and execute its first step.
         
-        # For complex commands, use vision model to plan
-        self._log("🧠 Planning actions...")
-        steps = self.vision.plan_action(command, image_path)
+        ``steps`` is a plan made earlier (see automate's ``batch_size``),
+        in which case the model isn't asked again and the screenshot is
+        only encoded if an element search needs it.
+        """
+        if steps is None:
+            # Encode once for the plan and any follow-up element search
+            image_path = self.vision.prepare_image(image_path)
+            self._log("🧠 Planning actions...")
+            steps = self.vision.plan_action(command, image_path)
         
         if not steps:
             return ActionResult(
@@ -179,6 +328,14 @@ class VisionAgent:
             direction = step.get("value", "down")
             return self.scroll(direction)
         
+        elif action == "wait":
+            try:
+                seconds = float(step.get("value") or 1)
+            except (TypeError, ValueError):
+                seconds = 1.0
+            self._log("⏳ Waiting %ss", seconds)
+            return self.actions.execute("wait", seconds)
+        
         return ActionResult(
             success=False,
             action=command,
@@ -186,72 +343,137 @@ class VisionAgent:
             error="Unknown action"
         )
     
-    def automate(self, commands: Union[str, List[str]]) -> AutomationResult:
-        """Execute multiple commands in sequence."""
+    def automate(
+        self,
+        commands: Union[str, List[str]],
+        batch_size: int = 1,
+        on_step: Optional[Callable[[StepResult], None]] = None
+    ) -> AutomationResult:
+        """Execute multiple commands in sequence.
+        
+        With ``batch_size`` above 1 (capped at ``MAX_BATCH_SIZE``), up to
+        that many consecutive commands that need the planner are planned in
+        one request against the screenshot taken before the first of them.
+        Each step still gets its own screenshot for element searches, but
+        planned coordinates come from the earlier screen, so only batch
+        steps that don't move things around. If the batched request fails,
+        those commands are planned one by one as usual.
+        
+        ``on_step`` is called with each StepResult as soon as the step
+        finishes, so progress can be recorded even if the run is cut short.
+        """
         start_time = time.time()
+        batch_size = min(batch_size, MAX_BATCH_SIZE)
         
         # Parse commands
         if isinstance(commands, str):
             # Split by newlines and numbered items
-            import re
-            commands = re.split(r'\n\d+\.\s*|\n-\s*|\n', commands)
+            # Leading newline so the first item's number is stripped too
+            commands = _SPLIT_CMDS.split("\n" + commands)
             commands = [c.strip() for c in commands if c.strip()]
         
-        self._log(f"🤖 Starting automation: {len(commands)} steps")
+        self._log("🤖 Starting automation: %d steps", len(commands))
         
         results = []
         success_count = 0
+        # Step number -> plan made ahead of time by a batched request
+        plans: dict[int, list[dict]] = {}
         
-        for i, command in enumerate(commands, 1):
-            self._log(f"\n--- Step {i}/{len(commands)}: {command} ---")
-            
-            try:
-                # Take fresh screenshot for each step
-                screenshot = self._take_screenshot()
-                action_result = self.do(command, screenshot)
+        # Ask once for the whole script instead of once per action
+        self.actions.approve_plan(commands)
+        # Screenshots are written to disk here while the vision call runs;
+        # each one is still captured only after the previous action finished
+        saver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="va-save")
+        
+        try:
+            for i, command in enumerate(commands, 1):
+                self._log("\n--- Step %d/%d: %s ---", i, len(commands), command)
                 
-                step_result = StepResult(
-                    step_number=i,
-                    command=command,
-                    success=action_result.success,
-                    action_result=action_result,
-                )
+                try:
+                    # Take fresh screenshot for each step
+                    screenshot = self._grab_screen(saver)
+                    if batch_size > 1 and i not in plans and self._needs_plan(command):
+                        # Encoded once for the batch and this step's own use
+                        screenshot = self.vision.prepare_image(screenshot)
+                        plans.update(self._plan_ahead(commands, i, batch_size, screenshot))
+                    steps = plans.pop(i, None)
+                    if steps:
+                        self._log("🤖 Command: %s", command)
+                        action_result = self._do_plan(command, screenshot, steps)
+                    else:
+                        action_result = self.do(command, screenshot)
+                    
+                    step_result = StepResult(
+                        step_number=i,
+                        command=command,
+                        success=action_result.success,
+                        action_result=action_result,
+                    )
+                    
+                    if action_result.success:
+                        success_count += 1
+                        self._log("✅ Step %d complete", i)
+                    else:
+                        self._log("❌ Step %d failed: %s", i, action_result.error)
+                    
+                except Exception as e:
+                    step_result = StepResult(
+                        step_number=i,
+                        command=command,
+                        success=False,
+                        error=str(e)
+                    )
+                    self._log("❌ Step %d error: %s", i, e)
                 
-                if action_result.success:
-                    success_count += 1
-                    self._log(f"✅ Step {i} complete")
-                else:
-                    self._log(f"❌ Step {i} failed: {action_result.error}")
+                results.append(step_result)
+                if on_step is not None:
+                    on_step(step_result)
                 
-            except Exception as e:
-                step_result = StepResult(
-                    step_number=i,
-                    command=command,
-                    success=False,
-                    error=str(e)
-                )
-                self._log(f"❌ Step {i} error: {e}")
-            
-            results.append(step_result)
-            
-            # Small delay between steps
-            time.sleep(0.5)
+                # Let the UI settle before the next screenshot
+                self.actions.wait_until_stable(timeout=0.5)
+        
+        finally:
+            # Even if interrupted, don't leave later actions pre-approved
+            saver.shutdown(wait=True)
+            self.actions.revoke_approval()
         
         duration = time.time() - start_time
         all_success = success_count == len(commands)
         
-        self._log(f"\n🎉 Automation {'complete' if all_success else 'finished with errors'}!")
-        self._log(f"   {success_count}/{len(commands)} steps succeeded")
-        self._log(f"   Duration: {duration:.1f}s")
+        self._log("\n🎉 Automation %s!", "complete" if all_success else "finished with errors")
+        self._log("   %d/%d steps succeeded", success_count, len(commands))
+        self._log("   Duration: %.1fs", duration)
         
         return AutomationResult(
             success=all_success,
             total_steps=len(commands),
             completed_steps=success_count,
-            steps=results,
+            steps=tuple(results),
             duration_seconds=duration,
         )
     
+    def _plan_ahead(
+        self,
+        commands: List[str],
+        start: int,
+        batch_size: int,
+        screenshot: ImageSource
+    ) -> dict[int, list[dict]]:
+        """Plan the run of planner-bound commands from step ``start`` in one request."""
+        batch = []
+        for command in islice(commands, start - 1, start - 1 + batch_size):
+            if not self._needs_plan(command):
+                break
+            batch.append(command)
+        self._log("🧠 Planning %d steps...", len(batch))
+        try:
+            plans = self.vision.plan_batch(batch, screenshot)
+        except Exception as e:
+            # Empty plans send these steps through do() without retrying the batch
+            self._log("⚠️ Batch planning failed, planning steps one by one: %s", e)
+            plans = [[] for _ in batch]
+        return dict(enumerate(plans, start))
+    
     def interactive(self):
         """Run in interactive mode."""
         print("👁️ VisionAgent Interactive Mode")
@@ -265,39 +487,41 @@ class VisionAgent:
                 if not user_input:
                     continue
                 
-                if user_input.lower() in ("quit", "exit", "q"):
+                input_lower = user_input.lower()
+                
+                if input_lower in ("quit", "exit", "q"):
                     print("Goodbye!")
                     break
                 
-                if user_input.lower() == "screenshot":
+                if input_lower == "screenshot":
                     path = self._take_screenshot()
                     print(f"📸 Saved: {path}")
                 
-                elif user_input.lower().startswith("analyze"):
+                elif input_lower.startswith("analyze"):
                     parts = user_input.split(maxsplit=1)
                     path = parts[1] if len(parts) > 1 else self._take_screenshot()
                     result = self.analyze(path)
                     print(f"\n{result.description}\n")
-                    for el in result.elements[:5]:
+                    for el in islice(result.elements, 5):
                         print(f"  - [{el.element_type}] {el.description} at ({el.x}, {el.y})")
                 
-                elif user_input.lower().startswith("find "):
+                elif input_lower.startswith("find "):
                     target = user_input[5:]
                     element = self.find_element(target)
                     if element:
                         print(f"Found: {element.description} at ({element.x}, {element.y})")
                 
-                elif user_input.lower().startswith("click "):
+                elif input_lower.startswith("click "):
                     parts = user_input.split()
                     if len(parts) >= 3:
                         x, y = int(parts[1]), int(parts[2])
                         self.click(x, y)
                 
-                elif user_input.lower().startswith("type "):
+                elif input_lower.startswith("type "):
                     text = user_input[5:]
                     self.type_text(text)
                 
-                elif user_input.lower().startswith("do "):
+                elif input_lower.startswith("do "):
                     command = user_input[3:]
                     self.do(command)
                 
@@ -1,15 +1,48 @@
 """Vision model integration for analyzing screenshots."""
 
+import asyncio
 import base64
+import functools
+import hashlib
+import importlib.util
+import io
 import json
-from dataclasses import dataclass, field
+import mmap
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Optional, Union
+from typing import NamedTuple, Optional, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from PIL import Image
 
+from . import _spatial
 
-@dataclass
+# orjson parses large replies faster; its JSONDecodeError subclasses the
+# stdlib one, so callers only need to catch json.JSONDecodeError
+try:
+    import orjson
+    _loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _loads = json.loads
+    ORJSON_AVAILABLE = False
+
+# Screenshots larger than this on their longest side are downscaled and
+# sent as JPEG; models locate elements just as well on the smaller image
+MAX_IMAGE_SIDE = 1600
+JPEG_QUALITY = 85
+
+# Output token budget for one plan_batch() reply; stays within the output
+# limit of current models however many commands are batched
+MAX_PLAN_TOKENS = 4096
+
+# Multiplex requests over one connection when the h2 package is installed
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(slots=True, frozen=True)
 class ElementLocation:
     """Location of a UI element."""
     description: str
@@ -31,21 +64,217 @@ class ElementLocation:
         return (self.x, self.y)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
-    """Result of analyzing a screenshot."""
+    """Result of analyzing a screenshot.
+    
+    ``elements`` and ``text_content`` are stored as tuples, so a result
+    (which may be shared through the model's cache) can't be changed after
+    its lookup tables are built.
+    """
     description: str
-    elements: list[ElementLocation] = field(default_factory=list)
-    text_content: list[str] = field(default_factory=list)
+    elements: tuple[ElementLocation, ...] = ()
+    text_content: tuple[str, ...] = ()
     raw_response: str = ""
+    # Lookup tables for find_element(), built once from ``elements``
+    _lower_descs: list[str] = field(init=False, repr=False, compare=False)
+    _token_index: dict[str, list[int]] = field(init=False, repr=False, compare=False)
+    # Bounding boxes for the spatial queries, built on first use
+    _boxes: Optional[list[_spatial.Box]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Frozen dataclass: bypass __setattr__ to fill the derived fields
+        object.__setattr__(self, "elements", tuple(self.elements))
+        object.__setattr__(self, "text_content", tuple(self.text_content))
+        lower_descs = [el.description.lower() for el in self.elements]
+        token_index: dict[str, list[int]] = {}
+        for i, desc in enumerate(lower_descs):
+            for token in dict.fromkeys(desc.split()):
+                token_index.setdefault(token, []).append(i)
+        object.__setattr__(self, "_lower_descs", lower_descs)
+        object.__setattr__(self, "_token_index", token_index)
     
     def find_element(self, description: str) -> Optional[ElementLocation]:
-        """Find element matching description."""
+        """Find the first element whose description contains ``description``.
+        
+        A whole-word match found in the token index bounds the search, so
+        only the elements before it need a substring check.
+        """
         description_lower = description.lower()
-        for element in self.elements:
-            if description_lower in element.description.lower():
-                return element
-        return None
+        lower_descs = self._lower_descs
+        hits = self._token_index.get(description_lower)
+        end = hits[0] if hits else len(lower_descs)
+        for i in range(end):
+            if description_lower in lower_descs[i]:
+                return self.elements[i]
+        return self.elements[end] if hits else None
+    
+    def _get_boxes(self) -> list[_spatial.Box]:
+        """(x, y, width, height) per element.
+        
+        Like ElementLocation.center, an element is only given a size when
+        both width and height are set; otherwise its box is just (x, y).
+        """
+        if self._boxes is None:
+            boxes = [
+                (el.x, el.y, el.width, el.height) if el.width and el.height
+                else (el.x, el.y, 0, 0)
+                for el in self.elements
+            ]
+            object.__setattr__(self, "_boxes", boxes)
+        return self._boxes
+    
+    def nearest_element(self, x: int, y: int) -> Optional[ElementLocation]:
+        """Find the element whose center is closest to (x, y)."""
+        index = _spatial.nearest(self._get_boxes(), x, y)
+        return self.elements[index] if index >= 0 else None
+    
+    def elements_at(self, x: int, y: int) -> list[ElementLocation]:
+        """Find all elements whose bounding box contains (x, y)."""
+        return [self.elements[i] for i in _spatial.containing(self._get_boxes(), x, y)]
+
+
+_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+def _media_type(image_path: Union[str, Path]) -> str:
+    """Get media type from file extension."""
+    return _MEDIA_TYPES.get(Path(image_path).suffix.lower(), "image/png")
+
+
+class PreparedImage(NamedTuple):
+    """An image encoded for a request, with a digest of its bytes.
+    
+    ``scale`` maps coordinates on the sent image back to the original
+    (greater than 1 when the image was downscaled).
+    """
+    data: str
+    media_type: str
+    digest: bytes
+    scale: float = 1.0
+    
+    def __repr__(self) -> str:
+        return f"PreparedImage({self.media_type}, {len(self.data)} base64 chars)"
+
+
+# A screenshot on disk, one captured in memory, or one already encoded
+ImageSource = Union[str, Path, Image.Image, PreparedImage]
+
+
+def _digest(data) -> bytes:
+    """Content hash used to recognise identical screenshots."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _pixel_digest(image: Image.Image) -> bytes:
+    """Content hash of an image's pixels, including its mode and size.
+    
+    The raw bytes alone would match for e.g. a 3200x1800 and an 1800x3200
+    frame holding the same data.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.width}x{image.height}:".encode())
+    h.update(image.tobytes())
+    return h.digest()
+
+
+def _b64(data) -> str:
+    """Base64-encode bytes for a data URL."""
+    return base64.b64encode(data).decode("utf-8")
+
+
+def _downscale(image: Image.Image, digest: bytes, max_side: int) -> PreparedImage:
+    """Shrink an image to ``max_side`` on its longest side and JPEG-encode it."""
+    scale = max(image.size) / max_side
+    size = (max(1, round(image.width / scale)), max(1, round(image.height / scale)))
+    small = image.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    small.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+    return PreparedImage(_b64(buffer.getbuffer()), "image/jpeg", digest, scale)
+
+
+@functools.lru_cache(maxsize=8)
+def _encode_file(
+    path: str, mtime_ns: int, size: int, max_side: Optional[int] = MAX_IMAGE_SIDE
+) -> PreparedImage:
+    """Read and base64-encode an image file, downscaling it if too large.
+    
+    ``mtime_ns`` and ``size`` are only part of the cache key, so a file
+    that is rewritten in place gets encoded again. The file is memory-mapped
+    so its bytes are hashed and encoded without being copied first.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        try:
+            mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files (and some filesystems) can't be mapped
+            with open(fd, "rb", closefd=False) as f:
+                raw = f.read()
+            return _encode_buffer(raw, io.BytesIO(raw), path, max_side)
+        with mapped:
+            return _encode_buffer(mapped, mapped, path, max_side)
+    finally:
+        os.close(fd)
+
+
+def _encode_buffer(raw, stream, path: str, max_side: Optional[int]) -> PreparedImage:
+    """Encode image file bytes; ``stream`` is a seekable file over ``raw``."""
+    digest = _digest(raw)
+    if max_side:
+        with Image.open(stream) as image:
+            if max(image.size) > max_side:
+                return _downscale(image, digest, max_side)
+    return PreparedImage(_b64(raw), _media_type(path), digest)
+
+
+def _encode_pil(
+    image: Image.Image, max_side: Optional[int] = MAX_IMAGE_SIDE
+) -> PreparedImage:
+    """Encode an in-memory image to base64, favouring speed over size.
+    
+    Small images are sent as PNG; larger ones are downscaled to JPEG.
+    """
+    if max_side and max(image.size) > max_side:
+        # Hash the pixels, since the JPEG bytes are only made after resizing
+        return _downscale(image, _pixel_digest(image), max_side)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    raw = buffer.getbuffer()
+    return PreparedImage(_b64(raw), "image/png", _digest(raw))
+
+
+def _rescale(element: ElementLocation, scale: float) -> ElementLocation:
+    """Map an element located on a downscaled image back to screen pixels."""
+    if scale == 1.0:
+        return element
+    
+    def up(value):
+        return round(value * scale) if isinstance(value, (int, float)) else value
+    
+    return replace(
+        element,
+        x=up(element.x),
+        y=up(element.y),
+        width=up(element.width),
+        height=up(element.height),
+    )
+
+
+def _rescale_steps(steps: list[dict], scale: float) -> list[dict]:
+    """Map planned x/y coordinates on a downscaled image back to screen pixels."""
+    if scale != 1.0:
+        for step in steps:
+            for axis in ("x", "y"):
+                if isinstance(step.get(axis), (int, float)):
+                    step[axis] = round(step[axis] * scale)
+    return steps
 
 
 class VisionModel:
@@ -55,39 +284,165 @@ class VisionModel:
         self,
         provider: str = "openai",
         model: str = "gpt-4o",
-        client: Optional[OpenAI] = None
+        client: Optional[OpenAI] = None,
+        async_client: Optional[AsyncOpenAI] = None,
+        cache_size: int = 32,
+        max_image_side: Optional[int] = MAX_IMAGE_SIDE
     ):
         self.provider = provider
         self.model = model
+        # Longest side sent to the model; None sends images at full size
+        self.max_image_side = max_image_side
+        self._async_client = async_client
+        # Client created by async_client for the running event loop, as (loop, client)
+        self._loop_client: Optional[tuple[asyncio.AbstractEventLoop, AsyncOpenAI]] = None
+        # Results for identical screenshots, keyed by image digest (LRU)
+        self.cache_size = cache_size
+        self._analyze_cache: OrderedDict[bytes, AnalysisResult] = OrderedDict()
+        self._find_cache: OrderedDict[tuple[bytes, str], ElementLocation] = OrderedDict()
         
         if provider == "openai":
-            self.client = client or OpenAI()
+            self.client = client or OpenAI(
+                http_client=DefaultHttpxClient(http2=H2_AVAILABLE)
+            )
         else:
             raise ValueError(f"Unsupported provider: {provider}")
     
-    def _encode_image(self, image_path: Union[str, Path]) -> str:
+    def prepare_image(self, image_path: ImageSource) -> PreparedImage:
+        """Get the base64 data, media type and digest for an image.
+        
+        The result can be passed to the other methods in place of the
+        image, so a screenshot used for several requests is encoded once.
+        
+        Files are cached by path, modification time and size, so the same
+        screenshot is only read and encoded once. In-memory images are
+        encoded straight to base64 without touching the disk. Images larger
+        than ``max_image_side`` are downscaled and sent as JPEG.
+        """
+        if isinstance(image_path, PreparedImage):
+            return image_path
+        if isinstance(image_path, Image.Image):
+            return _encode_pil(image_path, self.max_image_side)
+        path = Path(image_path).resolve()
+        stat = path.stat()
+        return _encode_file(
+            str(path), stat.st_mtime_ns, stat.st_size, self.max_image_side
+        )
+    
+    def _encode_image(self, image_path: ImageSource) -> str:
         """Encode image to base64."""
-        path = Path(image_path)
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-    
-    def _get_image_media_type(self, image_path: Union[str, Path]) -> str:
-        """Get media type from file extension."""
-        ext = Path(image_path).suffix.lower()
-        media_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
+        return self.prepare_image(image_path).data
+    
+    def _get_image_media_type(self, image_path: ImageSource) -> str:
+        """Get the media type the image will be sent as."""
+        return self.prepare_image(image_path).media_type
+    
+    def _image_content(self, prepared: PreparedImage) -> dict:
+        """Build the image part of a user message."""
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{prepared.media_type};base64,{prepared.data}"
+            }
         }
-        return media_types.get(ext, "image/png")
     
-    def analyze(self, image_path: Union[str, Path]) -> AnalysisResult:
-        """Analyze a screenshot and describe its contents."""
-        image_data = self._encode_image(image_path)
-        media_type = self._get_image_media_type(image_path)
+    def _cache_get(self, cache: OrderedDict, key):
+        """Look up a cached result, marking it as recently used."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, cache: OrderedDict, key, value):
+        """Store a result, evicting the least recently used beyond cache_size."""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+    
+    def _request(
+        self,
+        system_prompt: str,
+        text: str,
+        prepared: PreparedImage,
+        max_tokens: int
+    ) -> dict:
+        """Build chat completion arguments shared by the sync and async calls."""
+        return dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": text},
+                        self._image_content(prepared),
+                    ]
+                }
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=max_tokens,
+        )
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Async OpenAI client for the running event loop.
+        
+        A client passed to __init__ is always used as-is. Otherwise one is
+        created on first use in each event loop, since its connections
+        belong to the loop that opened them; aclose() closes it.
+        """
+        if self._async_client is not None:
+            return self._async_client
+        loop = asyncio.get_running_loop()
+        if self._loop_client is None or self._loop_client[0] is not loop:
+            client = AsyncOpenAI(
+                http_client=DefaultAsyncHttpxClient(http2=H2_AVAILABLE)
+            )
+            self._loop_client = (loop, client)
+        return self._loop_client[1]
+    
+    async def aclose(self):
+        """Close the async client created for the running event loop, if any."""
+        if self._loop_client is not None:
+            loop, client = self._loop_client
+            self._loop_client = None
+            if loop is asyncio.get_running_loop():
+                await client.close()
+    
+    def analyze(self, image_path: ImageSource) -> AnalysisResult:
+        """Analyze a screenshot and describe its contents.
         
+        Results are reused for screenshots identical to one already analyzed.
+        """
+        prepared = self.prepare_image(image_path)
+        result = self._cache_get(self._analyze_cache, prepared.digest)
+        if result is None:
+            response = self.client.chat.completions.create(
+                **self._analyze_request(prepared)
+            )
+            result = self._parse_analysis(
+                response.choices[0].message.content, prepared.scale
+            )
+            self._cache_put(self._analyze_cache, prepared.digest, result)
+        return result
+    
+    async def aanalyze(self, image_path: ImageSource) -> AnalysisResult:
+        """Async version of analyze()."""
+        prepared = self.prepare_image(image_path)
+        result = self._cache_get(self._analyze_cache, prepared.digest)
+        if result is None:
+            response = await self.async_client.chat.completions.create(
+                **self._analyze_request(prepared)
+            )
+            result = self._parse_analysis(
+                response.choices[0].message.content, prepared.scale
+            )
+            self._cache_put(self._analyze_cache, prepared.digest, result)
+        return result
+    
+    def _analyze_request(self, prepared: PreparedImage) -> dict:
+        """Build the request for analyze()."""
         system_prompt = """You are a UI analysis expert. Analyze the screenshot and provide:
 
 1. A detailed description of what's visible on screen
@@ -109,37 +464,19 @@ Return JSON:
     "text_content": ["visible text 1", "visible text 2"]
 }
 
-For coordinates, estimate based on a typical 1920x1080 screen. 
+Coordinates should be in pixels of the image.
 Place (0,0) at top-left. Be as accurate as possible."""
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": "Analyze this screenshot:"},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{media_type};base64,{image_data}"
-                            }
-                        }
-                    ]
-                }
-            ],
-            response_format={"type": "json_object"},
-            max_tokens=2000,
+        return self._request(
+            system_prompt, "Analyze this screenshot:", prepared, max_tokens=2000
         )
-        
-        raw_response = response.choices[0].message.content
-        
+    
+    def _parse_analysis(self, raw_response: str, scale: float = 1.0) -> AnalysisResult:
+        """Parse the model's reply to an analyze() request."""
         try:
-            data = json.loads(raw_response)
+            data = _loads(raw_response)
             
             elements = [
-                ElementLocation(
+                _rescale(ElementLocation(
                     description=el.get("description", ""),
                     x=el.get("x", 0),
                     y=el.get("y", 0),
@@ -147,7 +484,7 @@ Place (0,0) at top-left. Be as accurate as possible."""
                     height=el.get("height"),
                     element_type=el.get("type", "unknown"),
                     confidence=el.get("confidence", 0.8),
-                )
+                ), scale)
                 for el in data.get("elements", [])
             ]
             
@@ -166,12 +503,49 @@ Place (0,0) at top-left. Be as accurate as possible."""
     def find_element(
         self,
         description: str,
-        image_path: Union[str, Path]
+        image_path: ImageSource
     ) -> Optional[ElementLocation]:
-        """Find a specific element in the screenshot."""
-        image_data = self._encode_image(image_path)
-        media_type = self._get_image_media_type(image_path)
+        """Find a specific element in the screenshot.
         
+        Elements found on an identical screenshot are reused; misses are
+        always asked again.
+        """
+        prepared = self.prepare_image(image_path)
+        key = (prepared.digest, description)
+        element = self._cache_get(self._find_cache, key)
+        if element is None:
+            response = self.client.chat.completions.create(
+                **self._find_request(description, prepared)
+            )
+            element = self._parse_element(
+                response.choices[0].message.content, description, prepared.scale
+            )
+            if element is not None:
+                self._cache_put(self._find_cache, key, element)
+        return element
+    
+    async def afind_element(
+        self,
+        description: str,
+        image_path: ImageSource
+    ) -> Optional[ElementLocation]:
+        """Async version of find_element()."""
+        prepared = self.prepare_image(image_path)
+        key = (prepared.digest, description)
+        element = self._cache_get(self._find_cache, key)
+        if element is None:
+            response = await self.async_client.chat.completions.create(
+                **self._find_request(description, prepared)
+            )
+            element = self._parse_element(
+                response.choices[0].message.content, description, prepared.scale
+            )
+            if element is not None:
+                self._cache_put(self._find_cache, key, element)
+        return element
+    
+    def _find_request(self, description: str, prepared: PreparedImage) -> dict:
+        """Build the request for find_element()."""
         system_prompt = f"""You are a UI element locator. Find the element described by the user.
 
 Return JSON:
@@ -188,35 +562,24 @@ Return JSON:
 
 Coordinates should be based on the image dimensions.
 If you can't find the element, set found=false and explain in description."""
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": f"Find this element: {description}"},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{media_type};base64,{image_data}"
-                            }
-                        }
-                    ]
-                }
-            ],
-            response_format={"type": "json_object"},
-            max_tokens=500,
+        return self._request(
+            system_prompt, f"Find this element: {description}", prepared, max_tokens=500
         )
-        
+    
+    def _parse_element(
+        self,
+        raw_response: str,
+        description: str,
+        scale: float = 1.0
+    ) -> Optional[ElementLocation]:
+        """Parse the model's reply to a find_element() request."""
         try:
-            data = json.loads(response.choices[0].message.content)
+            data = _loads(raw_response)
             
             if not data.get("found", False):
                 return None
             
-            return ElementLocation(
+            return _rescale(ElementLocation(
                 description=data.get("description", description),
                 x=data.get("x", 0),
                 y=data.get("y", 0),
@@ -224,19 +587,36 @@ If you can't find the element, set found=false and explain in description."""
                 height=data.get("height"),
                 element_type=data.get("type", "unknown"),
                 confidence=data.get("confidence", 0.5),
-            )
+            ), scale)
         except json.JSONDecodeError:
             return None
     
     def plan_action(
         self,
         command: str,
-        image_path: Union[str, Path]
+        image_path: ImageSource
     ) -> list[dict]:
         """Plan actions to accomplish a command."""
-        image_data = self._encode_image(image_path)
-        media_type = self._get_image_media_type(image_path)
-        
+        prepared = self.prepare_image(image_path)
+        response = self.client.chat.completions.create(
+            **self._plan_request(command, prepared)
+        )
+        return self._parse_plan(response.choices[0].message.content, prepared.scale)
+    
+    async def aplan_action(
+        self,
+        command: str,
+        image_path: ImageSource
+    ) -> list[dict]:
+        """Async version of plan_action()."""
+        prepared = self.prepare_image(image_path)
+        response = await self.async_client.chat.completions.create(
+            **self._plan_request(command, prepared)
+        )
+        return self._parse_plan(response.choices[0].message.content, prepared.scale)
+    
+    def _plan_request(self, command: str, prepared: PreparedImage) -> dict:
+        """Build the request for plan_action()."""
         system_prompt = """You are a UI automation planner. Given a command and screenshot,
 plan the steps needed to accomplish the task.
 
@@ -253,30 +633,82 @@ Return JSON:
     ],
     "reasoning": "Brief explanation of the plan"
 }"""
-
+        return self._request(
+            system_prompt, f"Command: {command}", prepared, max_tokens=1000
+        )
+    
+    def _parse_plan(self, raw_response: str, scale: float = 1.0) -> list[dict]:
+        """Parse the model's reply to a plan_action() request."""
+        try:
+            data = _loads(raw_response)
+        except json.JSONDecodeError:
+            return []
+        return _rescale_steps(data.get("steps", []), scale)
+    
+    def plan_batch(
+        self,
+        commands: list[str],
+        image_path: ImageSource
+    ) -> list[list[dict]]:
+        """Plan several commands against one screenshot in a single request.
+        
+        Returns one list of steps per command, in order; a command the
+        model gave no plan for gets an empty list.
+        """
+        if not commands:
+            return []
+        prepared = self.prepare_image(image_path)
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
+            **self._plan_batch_request(commands, prepared)
+        )
+        return self._parse_plan_batch(
+            response.choices[0].message.content, len(commands), prepared.scale
+        )
+    
+    def _plan_batch_request(self, commands: list[str], prepared: PreparedImage) -> dict:
+        """Build the request for plan_batch()."""
+        system_prompt = """You are a UI automation planner. Given numbered commands and a
+screenshot, plan the steps needed to accomplish each command. The commands
+run in order, each starting where the previous one left off.
+
+Return JSON with one plan per command, in the same order:
+{
+    "plans": [
+        {
+            "steps": [
                 {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": f"Command: {command}"},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{media_type};base64,{image_data}"
-                            }
-                        }
-                    ]
+                    "action": "click|type|scroll|wait",
+                    "target": "description of element to interact with",
+                    "value": "text to type or scroll amount (if applicable)",
+                    "x": <coordinate if known>,
+                    "y": <coordinate if known>
                 }
-            ],
-            response_format={"type": "json_object"},
-            max_tokens=1000,
+            ]
+        }
+    ],
+    "reasoning": "Brief explanation of the plans"
+}"""
+        text = "Commands:\n" + "\n".join(
+            f"{i}. {command}" for i, command in enumerate(commands, 1)
         )
-        
+        return self._request(
+            system_prompt, text, prepared,
+            max_tokens=min(1000 * len(commands), MAX_PLAN_TOKENS)
+        )
+    
+    def _parse_plan_batch(
+        self,
+        raw_response: str,
+        count: int,
+        scale: float = 1.0
+    ) -> list[list[dict]]:
+        """Parse the model's reply to a plan_batch() request."""
         try:
-            data = json.loads(response.choices[0].message.content)
-            return data.get("steps", [])
-        except json.JSONDecodeError:
-            return []
+            plans = _loads(raw_response).get("plans", [])
+        except (json.JSONDecodeError, AttributeError):
+            plans = []
+        result = [
+            _rescale_steps(plan.get("steps", []) if isinstance(plan, dict) else [], scale)
+            for plan in plans[:count]
+        ]
+        return result + [[] for _ in range(count - len(result))]